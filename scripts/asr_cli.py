@@ -4,131 +4,592 @@ Faster-Whisper ASR CLI for auto-video-workflow.
 Outputs segments as JSON and SRT.
 
 Usage:
-  python asr_cli.py <audio_path> <output_dir> [--language <lang>] [--vad]
+  python asr_cli.py <audio_path> <output_dir> [--language <lang>] [--vad|--no-vad] [--model <name>]
+                    [--device <dev>] [--compute-type <type>] [--no-quantize] [--batch-size <n>]
+                    [--beam-size <n>]
+  python asr_cli.py --serve [same options as defaults]
+
+In --serve mode the process stays alive and reads one JSON request per line
+from stdin ({"audio_path", "output_dir"} plus optional overrides named like
+the transcribe() options, e.g. "language", "vad", "model", "batch_size"),
+writing one JSON response per line to stdout. Loaded models are kept between
+requests. {"items": [{"audio_path", "output_dir"}, ...]} transcribes a batch,
+decoding each next file while the current one is transcribed.
 """
+import os
 import sys
 import json
+import time
+import wave
+import shutil
 import argparse
+import functools
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Optional
 
-def format_timestamp(seconds: float) -> str:
-    """Format seconds to SRT timestamp (HH:MM:SS,mmm)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-
-def segments_to_srt(segments: list) -> str:
-    """Convert segments to SRT format."""
-    lines = []
-    for i, seg in enumerate(segments, 1):
-        start = format_timestamp(seg["start"])
-        end = format_timestamp(seg["end"])
-        text = seg["text"].strip()
-        lines.append(f"{i}")
-        lines.append(f"{start} --> {end}")
-        lines.append(text)
-        lines.append("")
-    return "\n".join(lines)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def main():
-    parser = argparse.ArgumentParser(description="Faster-Whisper ASR CLI")
-    parser.add_argument("audio_path", help="Path to input audio file (WAV)")
-    parser.add_argument("output_dir", help="Output directory for segments.json and source.srt")
-    parser.add_argument("--language", default="auto", help="Language code (e.g., 'zh', 'en', 'ja') or 'auto'")
-    parser.add_argument("--vad", action="store_true", help="Enable VAD filter")
-    parser.add_argument("--model", default="base", help="Whisper model size (tiny, base, small, medium, large)")
-    args = parser.parse_args()
+try:
+    from faster_whisper import WhisperModel, decode_audio
+except ImportError:
+    WhisperModel = None
+    decode_audio = None
 
-    audio_path = Path(args.audio_path)
-    output_dir = Path(args.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+try:
+    import av
+    import numpy as np
+except ImportError:  # both ship as faster-whisper dependencies
+    av = None
+    np = None
 
-    if not audio_path.exists():
-        print(f"Error: Audio file not found: {audio_path}", file=sys.stderr)
-        sys.exit(1)
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:  # faster-whisper < 1.1
+    BatchedInferencePipeline = None
+
+def dumps(obj) -> str:
+    """Serialize to a single-line JSON string (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False)
 
+def write_json(path: Path, obj) -> None:
+    """Write indented UTF-8 JSON (orjson when installed).
+
+    The file is written next to its target and renamed into place, so readers
+    never see a partially written file.
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    if orjson is not None:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(path)
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds to SRT timestamp (HH:MM:SS,mmm), rounded to the nearest millisecond."""
+    ms = int(seconds * 1000 + 0.5)
+    s, ms = divmod(ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+def supported_cuda_compute_type(preferred: str) -> str:
+    """Return preferred if CTranslate2 supports it on the GPU, else the next of int8_float16, int8, float32."""
     try:
-        from faster_whisper import WhisperModel
-    except ImportError:
-        print("Error: faster-whisper not installed. Install with: pip install faster-whisper", file=sys.stderr)
-        sys.exit(1)
+        import ctranslate2
+        supported = ctranslate2.get_supported_compute_types("cuda")
+    except Exception:
+        return preferred
+    for candidate in (preferred, "int8_float16", "int8", "float32"):
+        if candidate in supported:
+            return candidate
+    return preferred
+
+@functools.lru_cache(maxsize=None)
+def select_device(device: str = "auto", compute_type: str = "auto", quantized: bool = True) -> tuple:
+    """Resolve the device and CTranslate2 compute type.
 
-    # Try GPU first, fallback to CPU with int8
+    device "auto" picks CUDA when available, else CPU. An explicit "cuda" on a host
+    without CUDA falls back to CPU with int8, which CTranslate2 runs on int8
+    dot-product kernels (AVX-VNNI/AMX where the CPU has them).
+    compute_type mapping:
+      auto    -> with quantized: int8_float16 on CUDA (int8 or float32 on GPUs that
+                 lack it), int8 on CPU (int8 weights halve memory traffic in the
+                 memory-bound decoder);
+                 without: CTranslate2 picks the fastest type the device supports
+      float16 -> first CTranslate2-supported type of float16, int8_float16, int8,
+                 float32 on the GPU (pre-Volta GPUs lack float16 and int8_float16)
+      other   -> passed through unchanged
+    """
     try:
         import torch
-        if torch.cuda.is_available():
-            device = "cuda"
-            compute_type = "float16"
-            print(f"Using GPU (CUDA) with {compute_type}", file=sys.stderr)
-        else:
-            device = "cpu"
-            compute_type = "int8"
-            print(f"Using CPU with {compute_type}", file=sys.stderr)
     except ImportError:
+        torch = None
+    try:
+        import ctranslate2
+        # CTranslate2 runs the model, so its view of CUDA is authoritative
+        cuda_available = ctranslate2.get_cuda_device_count() > 0
+    except ImportError:
+        cuda_available = torch is not None and torch.cuda.is_available()
+
+    if device == "auto":
+        device = "cuda" if cuda_available else "cpu"
+    elif device == "cuda" and not cuda_available:
+        print("Warning: CUDA requested but not available, falling back to cpu with int8", file=sys.stderr)
         device = "cpu"
         compute_type = "int8"
-        print(f"Using CPU with {compute_type} (torch not available)", file=sys.stderr)
 
-    print(f"Loading model: {args.model}", file=sys.stderr)
-    model = WhisperModel(args.model, device=device, compute_type=compute_type)
+    if compute_type == "auto" and quantized:
+        compute_type = supported_cuda_compute_type("int8_float16") if device == "cuda" else "int8"
+
+    if device == "cuda" and compute_type == "float16":
+        compute_type = supported_cuda_compute_type(compute_type)
+
+    suffix = "" if torch is not None else " (torch not available)"
+    print(f"Using {device} with compute_type={compute_type}{suffix}", file=sys.stderr)
+    return device, compute_type
+
+def supports_flash_attention(device: str) -> bool:
+    """FlashAttention in CTranslate2 needs a CUDA GPU with compute capability >= 8.0 (Ampere)."""
+    if device != "cuda":
+        return False
+    try:
+        import torch
+        return torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8
+    except Exception:
+        return False
+
+@functools.lru_cache(maxsize=2)
+def load_model(model_size: str, device: str, compute_type: str):
+    """Load a WhisperModel once per (model_size, device, compute_type)."""
+    # CTranslate2 intra-op threads only matter on CPU; on GPU a single thread avoids pool churn
+    cpu_threads = (os.cpu_count() or 4) if device == "cpu" else 1
+    print(f"Loading model: {model_size} (cpu_threads={cpu_threads})", file=sys.stderr)
+    options = {
+        "device": device,
+        "compute_type": compute_type,
+        "cpu_threads": cpu_threads,
+        "num_workers": 1,
+    }
+    # Flash attention cuts HBM traffic in the memory-bound decoder; Ampere+ GPUs only
+    if supports_flash_attention(device):
+        try:
+            model = WhisperModel(model_size, flash_attention=True, **options)
+        except (TypeError, ValueError, RuntimeError) as e:
+            # Older faster-whisper without the argument, or a CTranslate2 build without FlashAttention
+            print(f"Loading without flash attention: {e}", file=sys.stderr)
+            model = WhisperModel(model_size, **options)
+    else:
+        model = WhisperModel(model_size, **options)
+    # Report what CTranslate2 actually resolved (relevant for compute_type="auto")
+    resolved = getattr(model.model, "compute_type", compute_type)
+    print(f"Model loaded: {model_size} on {device} ({resolved})", file=sys.stderr)
+    return model
+
+SAMPLE_RATE = 16000
+FFMPEG_PATH = shutil.which("ffmpeg")
+PARTIAL_FLUSH_SECONDS = 5.0
+# Greedy decoding is ~beam_size times cheaper than beam search; segments that come out
+# degenerate (repetitive, compression ratio > 2.4) are re-decoded at rising temperatures
+TEMPERATURE_FALLBACK = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+COMPRESSION_RATIO_THRESHOLD = 2.4
+# Silero VAD settings shared by every request (faster-whisper only reads them)
+VAD_PARAMETERS = {
+    "min_silence_duration_ms": 500,
+    "speech_pad_ms": 200
+}
+# Adaptive VAD probe: share of 30 ms frames below -40 dBFS in the first 60 s
+VAD_PROBE_SECONDS = 60
+VAD_PROBE_FRAME_MS = 30
+VAD_SILENCE_DBFS = -40.0
+VAD_MIN_SILENCE_FRACTION = 0.1
+
+def load_audio(audio_path: Path):
+    """Decode audio once to a 16 kHz mono float32 array, the format Whisper consumes.
+
+    Accepts audio or video containers, so no WAV is ever staged on disk. WAVs already
+    in Whisper's format are read as-is; anything else is resampled to 16 kHz mono
+    while decoding, in an ffmpeg process piping raw PCM back when ffmpeg is on PATH,
+    otherwise in-process with PyAV.
+    """
+    if np is not None:
+        samples = read_whisper_wav(audio_path)
+        if samples is not None:
+            return samples
+    if FFMPEG_PATH is not None and np is not None:
+        return decode_with_ffmpeg(audio_path)
+    if av is None:
+        return decode_audio(str(audio_path), sampling_rate=SAMPLE_RATE)
+    return decode_with_pyav(audio_path)
+
+def pcm16_to_float(samples):
+    """Convert int16 PCM to float32 in [-1, 1), scaling in place so only one float copy exists."""
+    audio = samples.astype(np.float32)
+    audio *= 1 / 32768.0
+    return audio
+
+def read_whisper_wav(audio_path: Path):
+    """Read a 16 kHz mono 16-bit PCM WAV without decoding or resampling.
+
+    Returns None for any other file, which then goes through the regular decoders.
+    """
+    if audio_path.suffix.lower() != ".wav":
+        return None
+    try:
+        with wave.open(str(audio_path), "rb") as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (SAMPLE_RATE, 1, 2):
+                return None
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    return pcm16_to_float(np.frombuffer(frames, dtype=np.int16))
+
+def decode_with_ffmpeg(audio_path: Path):
+    """Decode the first audio stream to 16 kHz mono via an ffmpeg s16le stdout pipe."""
+    result = subprocess.run(
+        [
+            FFMPEG_PATH, "-nostdin", "-loglevel", "error",
+            "-threads", "0",
+            "-i", str(audio_path),
+            "-map", "0:a:0",
+            "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "-"
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="replace").strip()[-2000:]
+        raise RuntimeError(f"ffmpeg audio decode failed: {message}")
+    return pcm16_to_float(np.frombuffer(result.stdout, dtype=np.int16))
+
+def decode_with_pyav(audio_path: Path):
+    """Decode in-process with threaded codecs, collecting resampled frames as arrays."""
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+    chunks = []
+    with av.open(str(audio_path), metadata_errors="ignore") as container:
+        if not container.streams.audio:
+            raise ValueError(f"No audio stream in {audio_path}")
+        stream = container.streams.audio[0]
+        stream.thread_type = "AUTO"
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray())
+        # Drain samples still buffered in the resampler
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray())
+
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return pcm16_to_float(np.concatenate(chunks, axis=1)[0])
+
+def prewarm(model_size: str = "base", device: str = "auto", compute_type: str = "auto",
+            quantized: bool = True) -> None:
+    """Load a model and run one tiny transcription so the first real request is fast.
+
+    CTranslate2 selects kernels and allocates buffers on the first forward pass;
+    meant for long-lived callers such as --serve, one-shot runs gain nothing.
+    """
+    device, compute_type = select_device(device, compute_type, quantized)
+    model = load_model(model_size, device, compute_type)
+    if np is None:
+        return
+    started = time.monotonic()
+    segments_iter, _ = model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), beam_size=1)
+    for _ in segments_iter:
+        pass
+    print(f"Model warmed up in {time.monotonic() - started:.2f}s", file=sys.stderr)
+
+def warm_vad() -> None:
+    """Load faster-whisper's Silero VAD model now instead of during the first VAD request.
+
+    get_vad_model() is cached for the process, so this only moves the load earlier.
+    """
+    try:
+        from faster_whisper.vad import get_vad_model
+        get_vad_model()
+    except Exception as e:
+        print(f"Warning: failed to preload VAD model: {e}", file=sys.stderr)
+
+def should_use_vad(audio) -> bool:
+    """Enable VAD only when the first minute of audio has noticeable silence.
+
+    Only consulted for sequential decoding: there, on fluent speech VAD adds latency
+    per chunk without improving accuracy, while on conversational audio with pauses
+    it saves decode work by skipping silence.
+    """
+    if np is None:
+        return True
+    frame = SAMPLE_RATE * VAD_PROBE_FRAME_MS // 1000
+    probe = audio[:SAMPLE_RATE * VAD_PROBE_SECONDS]
+    count = len(probe) // frame
+    if count == 0:
+        return False
+    frames = probe[:count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    dbfs = 20 * np.log10(np.maximum(rms, 1e-10))
+    silent = float(np.mean(dbfs < VAD_SILENCE_DBFS))
+    use_vad = silent >= VAD_MIN_SILENCE_FRACTION
+    print(f"Silence fraction {silent:.0%}: VAD {'on' if use_vad else 'off'}", file=sys.stderr)
+    return use_vad
+
+def pick_batch_size(device: str) -> int:
+    """Batch size for BatchedInferencePipeline: small on CPU, larger on big GPUs."""
+    if device != "cuda":
+        return 4
+    try:
+        import torch
+        total_gb = torch.cuda.get_device_properties(0).total_memory / 1024 ** 3
+    except Exception:
+        return 16
+    return 32 if total_gb >= 16 else 16
+
+def transcribe(audio_path: Path, output_dir: Path, language: str = "auto",
+               vad: Optional[bool] = None, model_size: str = "base",
+               device: str = "auto", compute_type: str = "auto",
+               quantized: bool = True, batch_size: Optional[int] = None,
+               beam_size: int = 1,
+               on_segment: Optional[Callable[[dict], None]] = None,
+               audio=None) -> dict:
+    """Transcribe one audio file, write source_segments.json and source.srt, return a summary.
+
+    beam_size defaults to 1 (greedy with temperature fallback): typically within ~0.1 WER
+    of beam_size=5 for subtitles at a fraction of the decode cost. Raise it for accuracy.
+
+    vad=None keeps VAD on when the batched pipeline is available (it batches over VAD
+    chunks); on the sequential path it decides per file with should_use_vad().
+
+    on_segment, if given, is called with each segment dict as soon as it is decoded.
+    audio, if given, is the already decoded waveform of audio_path (see load_audio).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    device, compute_type = select_device(device, compute_type, quantized)
+    model = load_model(model_size, device, compute_type)
 
     # Language setting
-    language = None if args.language == "auto" else args.language
+    language = None if language == "auto" else language
 
-    # VAD settings
-    vad_filter = args.vad
-    vad_parameters = None
-    if vad_filter:
-        vad_parameters = {
-            "min_silence_duration_ms": 500,
-            "speech_pad_ms": 200
-        }
+    # Windows are decoded independently (no previous-text prompt), which avoids
+    # repetition loops that retry at high temperature; word timestamps would add an
+    # alignment pass. Segment-level timestamps, all the SRT needs, are unaffected.
+    decode_options = {
+        "beam_size": beam_size,
+        "temperature": TEMPERATURE_FALLBACK,
+        "compression_ratio_threshold": COMPRESSION_RATIO_THRESHOLD,
+        "condition_on_previous_text": False,
+        "word_timestamps": False,
+    }
 
     print(f"Transcribing: {audio_path}", file=sys.stderr)
-    segments_iter, info = model.transcribe(
-        str(audio_path),
-        language=language,
-        vad_filter=vad_filter,
-        vad_parameters=vad_parameters
-    )
+    if audio is None:
+        audio = load_audio(audio_path)
+
+    # VAD settings
+    if vad is None:
+        vad_filter = BatchedInferencePipeline is not None or should_use_vad(audio)
+    else:
+        vad_filter = vad
+    vad_parameters = VAD_PARAMETERS if vad_filter else None
+
+    # The batched pipeline needs VAD chunks to batch over; without VAD keep the sequential path
+    if vad_filter and BatchedInferencePipeline is not None:
+        batch_size = batch_size or pick_batch_size(device)
+        print(f"Using batched inference (batch_size={batch_size})", file=sys.stderr)
+        segments_iter, info = BatchedInferencePipeline(model=model).transcribe(
+            audio,
+            language=language,
+            vad_filter=True,
+            vad_parameters=vad_parameters,
+            batch_size=batch_size,
+            **decode_options
+        )
+    else:
+        segments_iter, info = model.transcribe(
+            audio,
+            language=language,
+            vad_filter=vad_filter,
+            vad_parameters=vad_parameters,
+            **decode_options
+        )
 
     if info.language:
         print(f"Detected language: {info.language} (probability: {info.language_probability:.2f})", file=sys.stderr)
 
-    # Collect segments
+    # Consume the lazy segment generator once, writing each cue as it is decoded.
+    # Cues go to source.partial.srt so watchers can pick up subtitles before the
+    # whole file is transcribed; it is renamed to source.srt once decoding finishes
     segments = []
-    for seg in segments_iter:
-        segments.append({
-            "start": round(seg.start, 3),
-            "end": round(seg.end, 3),
-            "text": seg.text.strip()
-        })
-        print(f"  [{seg.start:.2f} -> {seg.end:.2f}] {seg.text.strip()[:50]}...", file=sys.stderr)
+    partial_path = output_dir / "source.partial.srt"
+    with open(partial_path, "w", encoding="utf-8", buffering=1 << 16) as partial:
+        # Bind hot-loop callables locally; this loop runs once per cue on multi-hour inputs
+        fmt = format_timestamp
+        write = partial.write
+        append = segments.append
+        monotonic = time.monotonic
+        last_flush = monotonic()
+        for i, seg in enumerate(segments_iter, 1):
+            start, end = seg.start, seg.end
+            text = seg.text.strip()
+            segment = {
+                "start": round(start, 3),
+                "end": round(end, 3),
+                "text": text
+            }
+            append(segment)
+            print(f"  [{start:.2f} -> {end:.2f}] {text[:50]}...", file=sys.stderr)
+            write(f"{i}\n{fmt(start)} --> {fmt(end)}\n{text}\n\n")
+            if on_segment is not None:
+                on_segment(segment)
+            if monotonic() - last_flush >= PARTIAL_FLUSH_SECONDS:
+                partial.flush()
+                last_flush = monotonic()
 
     # Write JSON
     json_path = output_dir / "source_segments.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(segments, f, ensure_ascii=False, indent=2)
+    write_json(json_path, segments)
     print(f"Wrote: {json_path}", file=sys.stderr)
 
-    # Write SRT
+    # The streamed file already holds every cue; the rename is atomic, so
+    # source.srt only ever appears complete
     srt_path = output_dir / "source.srt"
-    srt_content = segments_to_srt(segments)
-    with open(srt_path, "w", encoding="utf-8") as f:
-        f.write(srt_content)
+    partial_path.replace(srt_path)
     print(f"Wrote: {srt_path}", file=sys.stderr)
 
-    # Output summary to stdout for Node.js to parse
-    result = {
+    return {
         "segments_count": len(segments),
         "language": info.language,
         "language_probability": info.language_probability,
         "json_path": str(json_path),
         "srt_path": str(srt_path)
     }
-    print(json.dumps(result))
+
+def transcribe_batch(items: list, **options):
+    """Transcribe (audio_path, output_dir) pairs in order, yielding each summary.
+
+    Audio for the next file is decoded on a prefetch thread while the current one
+    transcribes; ffmpeg/PyAV and CTranslate2 both release the GIL, so the decode
+    overlaps with inference.
+    """
+    if not items:
+        return
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pending = pool.submit(load_audio, items[0][0])
+        for index, (audio_path, output_dir) in enumerate(items):
+            audio = pending.result()
+            if index + 1 < len(items):
+                pending = pool.submit(load_audio, items[index + 1][0])
+            yield transcribe(audio_path, output_dir, audio=audio, **options)
+
+# Worker request fields -> transcribe() keyword arguments
+REQUEST_OPTIONS = {
+    "language": "language",
+    "vad": "vad",
+    "model": "model_size",
+    "device": "device",
+    "compute_type": "compute_type",
+    "quantized": "quantized",
+    "batch_size": "batch_size",
+    "beam_size": "beam_size",
+}
+
+def serve(defaults: dict) -> None:
+    """Answer newline-delimited JSON requests from stdin until EOF.
+
+    Non-null request fields override the CLI-level defaults for that request.
+    A request with "items" (a list of {"audio_path", "output_dir"}) runs
+    transcribe_batch() and answers with {"ok": true, "results": [...]}.
+    """
+    # Responses get a private handle on the real stdout. fd 1 itself is pointed at
+    # stderr, so stray prints from faster-whisper or native libraries (CTranslate2)
+    # can never be mistaken for the answer to a pending request.
+    sys.stdout.flush()
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    # Load and exercise the default model up front so it is warm by the time the first request arrives
+    try:
+        prewarm(defaults["model_size"], defaults["device"], defaults["compute_type"], defaults["quantized"])
+    except Exception as e:
+        print(f"Warning: failed to preload model {defaults['model_size']}: {e}", file=sys.stderr)
+    if defaults["vad"] is not False:
+        warm_vad()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            items = request.get("items") or [request]
+            paths = []
+            for item in items:
+                audio_path = Path(item["audio_path"])
+                if not audio_path.exists():
+                    raise FileNotFoundError(f"Audio file not found: {audio_path}")
+                paths.append((audio_path, Path(item["output_dir"])))
+            options = dict(defaults)
+            for field, kwarg in REQUEST_OPTIONS.items():
+                if request.get(field) is not None:
+                    options[kwarg] = request[field]
+            if "items" in request:
+                response = {"ok": True, "results": list(transcribe_batch(paths, **options))}
+            else:
+                response = {"ok": True, **transcribe(*paths[0], **options)}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        print(dumps(response), file=responses, flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Faster-Whisper ASR CLI")
+    parser.add_argument("audio_path", nargs="?", help="Path to input audio or video file")
+    parser.add_argument("output_dir", nargs="?", help="Output directory for segments.json and source.srt")
+    parser.add_argument("--language", default="auto", help="Language code (e.g., 'zh', 'en', 'ja') or 'auto'")
+    parser.add_argument("--vad", dest="vad", action="store_true", default=None,
+                        help="Always enable the VAD filter (default: decide from a silence probe)")
+    parser.add_argument("--no-vad", dest="vad", action="store_false", help="Never enable the VAD filter")
+    parser.add_argument("--model", default="base",
+                        help="Whisper model (tiny, base, small, medium, large-v3, large-v3-turbo, distil-large-v3)")
+    parser.add_argument("--device", default="auto", help="Device: auto, cuda or cpu")
+    parser.add_argument("--compute-type", default="auto",
+                        help="CTranslate2 compute type (auto, int8_float16, float16, int8, ...)")
+    parser.add_argument("--no-quantize", dest="quantized", action="store_false",
+                        help="With --compute-type auto, let CTranslate2 choose instead of forcing int8 weights")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Batched inference size when VAD is on (default: 4 on CPU, 16-32 on GPU)")
+    parser.add_argument("--beam-size", type=int, default=1,
+                        help="Decoder beam size (default: 1, greedy with temperature fallback)")
+    parser.add_argument("--serve", action="store_true", help="Run as a persistent worker reading JSON requests from stdin")
+    args = parser.parse_args()
+
+    # Node writes requests and reads responses as UTF-8 regardless of the platform's
+    # console encoding (JSON.stringify leaves non-ASCII paths unescaped)
+    sys.stdin.reconfigure(encoding="utf-8")
+    sys.stdout.reconfigure(encoding="utf-8")
+
+    if WhisperModel is None:
+        print("Error: faster-whisper not installed. Install with: pip install faster-whisper", file=sys.stderr)
+        sys.exit(1)
+
+    defaults = {
+        "language": args.language,
+        "vad": args.vad,
+        "model_size": args.model,
+        "device": args.device,
+        "compute_type": args.compute_type,
+        "quantized": args.quantized,
+        "batch_size": args.batch_size,
+        "beam_size": args.beam_size,
+    }
+
+    if args.serve:
+        serve(defaults)
+        return
+
+    if not args.audio_path or not args.output_dir:
+        parser.error("audio_path and output_dir are required unless --serve is given")
+
+    audio_path = Path(args.audio_path)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if not audio_path.exists():
+        print(f"Error: Audio file not found: {audio_path}", file=sys.stderr)
+        sys.exit(1)
+
+    result = transcribe(audio_path, output_dir, **defaults)
+
+    # Output summary to stdout for Node.js to parse
+    print(dumps(result))
 
 if __name__ == "__main__":
     main()
@@ -35,15 +35,18 @@ export async function runQuery<T = unknown>(
   });
 
   let sessionId: string | undefined;
-  let text = "";
+  const textParts: string[] = [];
   let structuredOutput: T | undefined;
 
   for await (const message of response) {
     if (message.type === "system" && message.subtype === "init") {
       sessionId = message.session_id;
     } else if (message.type === "assistant") {
-      if (typeof message.content === "string") {
-        text += message.content;
+      // Single pass over content blocks, dispatching on the block type tag
+      for (const block of message.message.content) {
+        if (block.type === "text") {
+          textParts.push(block.text);
+        }
       }
     } else if (message.type === "result") {
       const maybeStructured = (message as { structured_output?: T }).structured_output;
@@ -56,5 +59,6 @@ export async function runQuery<T = unknown>(
     }
   }
 
+  const text = textParts.length === 1 ? textParts[0] : textParts.join("\n");
   return { sessionId, text, structuredOutput };
 }
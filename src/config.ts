@@ -20,7 +20,9 @@ const PathsSchema = z.object({
 const RenderSchema = z.object({
   font_path: z.string(),
   subtitle_fontsize: z.number().int().positive(),
-  bgm_path: z.string().nullable()
+  bgm_path: z.string().nullable(),
+  encoder: z.enum(["auto", "nvenc", "amf", "x264"]).default("auto"),
+  quality: z.enum(["speed", "balanced", "quality"]).default("speed")
 });
 
 const ConfigSchema = z.object({
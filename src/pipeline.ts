@@ -14,7 +14,7 @@ import {
   updateStep
 } from "./jobs/job.js";
 import { download, preflight, preflightPasses, resolveChannelId, YtDlpInfo } from "./tools/ytdlp.js";
-import { burnSubtitles, extractAudio, normalizeLoudness, normalizeThumbnail, probeVideo } from "./tools/ffmpeg.js";
+import { burnSubtitles, normalizeThumbnail, probeVideo } from "./tools/ffmpeg.js";
 import { runAsr } from "./tools/asr.js";
 import { runTranslation } from "./nlp/translate.js";
 import { runMetadataGeneration } from "./nlp/metadata.js";
@@ -150,18 +150,20 @@ export async function processSingleVideo(
     job = updateStep(job, "preflight", nowIso());
     saveJob(jobFilePath, job);
 
-    // Save environment snapshot
-    try {
-      const envSnapshot = await getEnvSnapshot();
-      const snapshotPath = path.join(jobsDir, videoId, "env_snapshot.json");
-      ensureDir(path.dirname(snapshotPath));
-      writeJson(snapshotPath, envSnapshot);
-      logger.info(`[${videoId}] Environment snapshot saved`);
-    } catch (e) {
-      logger.warn(`[${videoId}] Failed to save env snapshot: ${e}`);
-    }
+    // Save environment snapshot (independent of preflight, so both run concurrently)
+    const snapshotTask = (async () => {
+      try {
+        const envSnapshot = await getEnvSnapshot();
+        const snapshotPath = path.join(jobsDir, videoId, "env_snapshot.json");
+        ensureDir(path.dirname(snapshotPath));
+        writeJson(snapshotPath, envSnapshot);
+        logger.info(`[${videoId}] Environment snapshot saved`);
+      } catch (e) {
+        logger.warn(`[${videoId}] Failed to save env snapshot: ${e}`);
+      }
+    })();
 
-    const preflightResult = await preflight(sourceUrl);
+    const [preflightResult] = await Promise.all([preflight(sourceUrl), snapshotTask]);
 
     // Save preflight info immediately (even if check fails, for debugging)
     savePreflightInfo(sourceDir, preflightResult.info);
@@ -193,36 +195,36 @@ export async function processSingleVideo(
     await download(sourceUrl, sourceDir, archivePath);
     logger.info(`[${videoId}] Download complete`);
 
-    // Step 3: Normalize thumbnail
+    // Step 3: Normalize thumbnail (runs in the background while ASR works on the audio)
     logger.info(`[${videoId}] Normalizing thumbnail...`);
     job = updateStep(job, "thumbnail", nowIso());
     saveJob(jobFilePath, job);
 
     const distDir = path.join(jobsDir, videoId, "dist");
-    try {
-      const thumbnailPath = await normalizeThumbnail(sourceDir, distDir);
-      logger.info(`[${videoId}] Thumbnail normalized to ${thumbnailPath}`);
-    } catch (thumbErr) {
-      // Thumbnail failure is non-fatal, just log warning
-      logger.warn(`[${videoId}] Thumbnail normalization failed: ${thumbErr}`);
-    }
+    const thumbnailTask = normalizeThumbnail(sourceDir, distDir).then(
+      (thumbnailPath) => {
+        logger.info(`[${videoId}] Thumbnail normalized to ${thumbnailPath}`);
+      },
+      (thumbErr) => {
+        // Thumbnail failure is non-fatal, just log warning
+        logger.warn(`[${videoId}] Thumbnail normalization failed: ${thumbErr}`);
+      }
+    );
 
-    // Step 4: ASR (Audio extraction + Speech recognition)
-    logger.info(`[${videoId}] Extracting audio...`);
+    // Step 4: ASR (speech recognition)
+    logger.info(`[${videoId}] Running ASR...`);
     job = updateStep(job, "asr", nowIso());
     saveJob(jobFilePath, job);
 
     const asrDir = path.join(jobsDir, videoId, "asr");
     const videoPath = path.join(sourceDir, "video.mp4");
-    const audioPath = path.join(asrDir, "audio.wav");
-
-    await extractAudio(videoPath, audioPath);
-    logger.info(`[${videoId}] Audio extracted to ${audioPath}`);
 
-    logger.info(`[${videoId}] Running ASR...`);
-    const asrResult = await runAsr(audioPath, asrDir, { vad: true });
+    // faster-whisper decodes the audio track straight from the container, so no WAV is staged
+    const asrResult = await runAsr(videoPath, asrDir);
     logger.info(`[${videoId}] ASR complete: ${asrResult.segmentsCount} segments, language=${asrResult.language}`);
 
+    await thumbnailTask;
+
     // Step 5: Translate
     logger.info(`[${videoId}] Translating segments...`);
     job = updateStep(job, "translate", nowIso());
@@ -232,21 +234,22 @@ export async function processSingleVideo(
     const translateResult = await runTranslation(asrDir, nlpDir);
     logger.info(`[${videoId}] Translation complete: ${translateResult.srtPath}`);
 
-    // Step 6: Render (burn subtitles + normalize loudness)
+    // Step 6: Render (burn subtitles + normalize loudness in a single ffmpeg pass)
     logger.info(`[${videoId}] Rendering video with subtitles...`);
     job = updateStep(job, "render", nowIso());
     saveJob(jobFilePath, job);
 
     const renderDir = path.join(jobsDir, videoId, "render");
     ensureDir(renderDir);
-    const subtitledPath = path.join(renderDir, "subtitled.mp4");
     const finalOutputPath = path.join(renderDir, "final_output.mp4");
 
-    await burnSubtitles(videoPath, translateResult.srtPath, config.render.font_path, subtitledPath);
-    logger.info(`[${videoId}] Subtitles burned`);
-
-    await normalizeLoudness(subtitledPath, finalOutputPath);
-    logger.info(`[${videoId}] Loudness normalized`);
+    await burnSubtitles(videoPath, translateResult.srtPath, config.render.font_path, finalOutputPath, {
+      encoder: config.render.encoder,
+      fontSize: config.render.subtitle_fontsize,
+      quality: config.render.quality,
+      loudnorm: true
+    });
+    logger.info(`[${videoId}] Subtitles burned and loudness normalized`);
 
     // Verify output is playable
     const probeResult = await probeVideo(finalOutputPath);
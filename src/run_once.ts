@@ -4,6 +4,7 @@ import { buildRunId } from "./utils/time.js";
 import { ensureDir } from "./utils/fs.js";
 import { createLogger } from "./utils/logger.js";
 import { fetchAndFilterCandidates, processSingleVideo } from "./pipeline.js";
+import { closeAsrWorker, getAsrWorker } from "./tools/asr.js";
 
 type RunContext = {
   runId: string;
@@ -59,24 +60,37 @@ export async function runOnce(config: AppConfig): Promise<void> {
   let failed = 0;
   let skipped = 0;
 
-  for (const candidate of candidates) {
-    logger.info(`Processing: ${candidate.videoId}`);
-    const result = await processSingleVideo(candidate, config, context.jobsDir, context.deliveriesDir, logger);
-
-    switch (result.status) {
-      case "succeeded":
-        succeeded++;
-        logger.info(`[${candidate.videoId}] Succeeded`);
-        break;
-      case "failed":
-        failed++;
-        logger.warn(`[${candidate.videoId}] Failed: ${result.reason}`);
-        break;
-      case "skipped":
-        skipped++;
-        logger.info(`[${candidate.videoId}] Skipped: ${result.reason}`);
-        break;
+  try {
+    // Warm up the ASR worker while the first video is preflighted and downloaded.
+    // A failure here is only logged; runAsr reports it again for each video.
+    try {
+      getAsrWorker().start();
+    } catch (error) {
+      logger.warn(`ASR worker warm-up failed: ${error}`);
     }
+
+    for (const candidate of candidates) {
+      logger.info(`Processing: ${candidate.videoId}`);
+      const result = await processSingleVideo(candidate, config, context.jobsDir, context.deliveriesDir, logger);
+
+      switch (result.status) {
+        case "succeeded":
+          succeeded++;
+          logger.info(`[${candidate.videoId}] Succeeded`);
+          break;
+        case "failed":
+          failed++;
+          logger.warn(`[${candidate.videoId}] Failed: ${result.reason}`);
+          break;
+        case "skipped":
+          skipped++;
+          logger.info(`[${candidate.videoId}] Skipped: ${result.reason}`);
+          break;
+      }
+    }
+  } finally {
+    // The ASR worker stays alive across videos; stop it so the run can exit
+    closeAsrWorker();
   }
 
   // Summary
@@ -0,0 +1,70 @@
+import fs from "node:fs";
+import path from "node:path";
+import { ensureDir, fileExists } from "../utils/fs.js";
+import { Segments } from "../nlp/segments.js";
+import { parseSrt } from "./srt.js";
+
+export type AssStyle = {
+  fontName: string;
+  fontSize: number;
+};
+
+/**
+ * Format seconds to ASS timestamp (H:MM:SS.cc)
+ */
+function formatAssTimestamp(seconds: number): string {
+  const totalCs = Math.max(0, Math.round(seconds * 100));
+  const cs = totalCs % 100;
+  const totalSeconds = Math.floor(totalCs / 100);
+  const secs = totalSeconds % 60;
+  const minutes = Math.floor(totalSeconds / 60) % 60;
+  const hours = Math.floor(totalSeconds / 3600);
+
+  const pad = (value: number) => value.toString().padStart(2, "0");
+  return `${hours}:${pad(minutes)}:${pad(secs)}.${pad(cs)}`;
+}
+
+/**
+ * Convert segments to an ASS script with the burn-in style baked into the header.
+ * PlayRes matches what ffmpeg uses for SRT input, so font sizes render the same.
+ */
+export function segmentsToAss(segments: Segments, style: AssStyle): string {
+  const lines: string[] = [
+    "[Script Info]",
+    "ScriptType: v4.00+",
+    "PlayResX: 384",
+    "PlayResY: 288",
+    "ScaledBorderAndShadow: yes",
+    "",
+    "[V4+ Styles]",
+    "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+    `Style: Default,${style.fontName},${style.fontSize},&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,0,2,10,10,10,1`,
+    "",
+    "[Events]",
+    "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text"
+  ];
+
+  for (const seg of segments) {
+    const text = seg.text.trim().replace(/\r?\n/g, "\\N");
+    lines.push(
+      `Dialogue: 0,${formatAssTimestamp(seg.start)},${formatAssTimestamp(seg.end)},Default,,0,0,0,,${text}`
+    );
+  }
+
+  return `${lines.join("\n")}\n`;
+}
+
+/**
+ * Convert an SRT file to a styled ASS file.
+ * An existing ASS file newer than the SRT is reused as-is.
+ */
+export function srtToAss(srtPath: string, assPath: string, style: AssStyle): string {
+  if (fileExists(assPath) && fs.statSync(assPath).mtimeMs >= fs.statSync(srtPath).mtimeMs) {
+    return assPath;
+  }
+
+  const segments = parseSrt(fs.readFileSync(srtPath, "utf8"));
+  ensureDir(path.dirname(assPath));
+  fs.writeFileSync(assPath, segmentsToAss(segments, style), "utf8");
+  return assPath;
+}
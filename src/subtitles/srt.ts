@@ -7,10 +7,13 @@ import { Segment, Segments } from "../nlp/segments.js";
  * Format seconds to SRT timestamp (HH:MM:SS,mmm)
  */
 function formatTimestamp(seconds: number): string {
-  const hours = Math.floor(seconds / 3600);
-  const minutes = Math.floor((seconds % 3600) / 60);
-  const secs = Math.floor(seconds % 60);
-  const millis = Math.floor((seconds % 1) * 1000);
+  // Round once to integer milliseconds; flooring float remainders turns 62.9995 into 00:01:02,999
+  const totalMs = Math.max(0, Math.round(seconds * 1000));
+  const millis = totalMs % 1000;
+  const totalSeconds = Math.floor(totalMs / 1000);
+  const secs = totalSeconds % 60;
+  const minutes = Math.floor(totalSeconds / 60) % 60;
+  const hours = Math.floor(totalSeconds / 3600);
 
   const hStr = hours.toString().padStart(2, "0");
   const mStr = minutes.toString().padStart(2, "0");
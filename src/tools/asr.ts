@@ -1,6 +1,7 @@
 import path from "node:path";
+import { ChildProcessWithoutNullStreams, spawn } from "node:child_process";
+import { createInterface } from "node:readline";
 import { ensureDir, fileExists, readJson } from "../utils/fs.js";
-import { runCommand } from "./command.js";
 
 const DEFAULT_TIMEOUT_MS = 300_000; // 5 minutes for ASR
 
@@ -12,10 +13,27 @@ type AsrResult = {
   srtPath: string;
 };
 
+type AsrOutput = {
+  segments_count: number;
+  language: string | null;
+  language_probability: number | null;
+  json_path: string;
+  srt_path: string;
+};
+
 type AsrOptions = {
   language?: string;
+  // Force VAD on or off; left unset, the worker keeps it on for batched inference
+  // and otherwise probes the audio's silence fraction
   vad?: boolean;
   model?: string;
+  device?: "auto" | "cuda" | "cpu";
+  computeType?: string;
+  // With computeType "auto": force int8 weights (default) or let CTranslate2 choose
+  quantized?: boolean;
+  batchSize?: number;
+  // Decoder beam size; defaults to 1 (greedy with temperature fallback) on the Python side
+  beamSize?: number;
   timeoutMs?: number;
 };
 
@@ -28,72 +46,239 @@ function getAsrScriptPath(): string {
   return path.join(projectRoot, "scripts", "asr_cli.py");
 }
 
+function toAsrResult(output: AsrOutput): AsrResult {
+  return {
+    segmentsCount: output.segments_count,
+    language: output.language,
+    languageProbability: output.language_probability,
+    jsonPath: output.json_path,
+    srtPath: output.srt_path
+  };
+}
+
+export type AsrBatchItem = {
+  audioPath: string;
+  outputDir: string;
+};
+
 /**
- * Run ASR on an audio file using faster-whisper via Python CLI.
- * Produces source_segments.json and source.srt in the output directory.
+ * Per-request overrides in the worker's JSON field names (null = worker default)
  */
-export async function runAsr(
-  audioPath: string,
-  outputDir: string,
-  options: AsrOptions = {}
-): Promise<AsrResult> {
-  ensureDir(outputDir);
+function toRequestOptions(options: AsrOptions): Record<string, unknown> {
+  return {
+    language: options.language ?? "auto",
+    vad: options.vad ?? null,
+    model: options.model ?? null,
+    device: options.device ?? null,
+    compute_type: options.computeType ?? null,
+    quantized: options.quantized ?? null,
+    batch_size: options.batchSize ?? null,
+    beam_size: options.beamSize ?? null
+  };
+}
+
+type PendingRequest = {
+  resolve: (response: unknown) => void;
+  reject: (error: Error) => void;
+  timeoutId: NodeJS.Timeout;
+};
 
-  const scriptPath = getAsrScriptPath();
-  if (!fileExists(scriptPath)) {
-    throw new Error(`ASR script not found: ${scriptPath}`);
+/**
+ * Long-lived `asr_cli.py --serve` process.
+ * The Python side keeps loaded Whisper models between requests, so only the
+ * first transcription pays for interpreter start-up and model load.
+ */
+export class AsrWorker {
+  private child: ChildProcessWithoutNullStreams | null = null;
+  private pending: PendingRequest[] = [];
+
+  /**
+   * Spawn the worker ahead of the first request so interpreter start-up and
+   * model load overlap with earlier pipeline stages.
+   */
+  start(): void {
+    this.ensureStarted();
   }
 
-  const args = ["python", scriptPath, audioPath, outputDir];
+  private ensureStarted(): ChildProcessWithoutNullStreams {
+    if (this.child) {
+      return this.child;
+    }
+
+    const scriptPath = getAsrScriptPath();
+    if (!fileExists(scriptPath)) {
+      throw new Error(`ASR script not found: ${scriptPath}`);
+    }
+
+    const child = spawn("python", [scriptPath, "--serve"], {
+      stdio: ["pipe", "pipe", "pipe"]
+    });
+    // Requests are answered in order, one response line each
+    const pending: PendingRequest[] = [];
+    let stderrTail = "";
+
+    const failAll = (error: Error) => {
+      if (this.child === child) {
+        this.child = null;
+      }
+      for (const request of pending.splice(0)) {
+        clearTimeout(request.timeoutId);
+        request.reject(error);
+      }
+    };
+
+    createInterface({ input: child.stdout, crlfDelay: Infinity }).on("line", (line) => {
+      const request = pending.shift();
+      if (!request) {
+        return;
+      }
+      clearTimeout(request.timeoutId);
+      try {
+        const response = JSON.parse(line) as { ok: true } | { ok: false; error: string };
+        if (response.ok) {
+          request.resolve(response);
+        } else {
+          request.reject(new Error(`ASR failed: ${response.error}`));
+        }
+      } catch {
+        request.reject(new Error(`Failed to parse ASR output: ${line}`));
+      }
+    });
+
+    // Always drain stderr (progress lines) so the worker never blocks on a full pipe
+    child.stderr.on("data", (chunk) => {
+      stderrTail = (stderrTail + chunk.toString()).slice(-8000);
+    });
+
+    child.on("error", failAll);
+    // Writing to a worker that already died (import error, CUDA OOM) fails with EPIPE
+    child.stdin.on("error", failAll);
+    child.on("close", (code) => {
+      failAll(new Error(`ASR worker exited (code=${code}): ${stderrTail.trim()}`));
+    });
 
-  if (options.language && options.language !== "auto") {
-    args.push("--language", options.language);
+    this.child = child;
+    this.pending = pending;
+    return child;
   }
 
-  if (options.vad) {
-    args.push("--vad");
+  private async request(payload: Record<string, unknown>, timeoutMs: number): Promise<unknown> {
+    const child = this.ensureStarted();
+    const pending = this.pending;
+
+    return await new Promise((resolve, reject) => {
+      const timeoutId = setTimeout(() => {
+        const index = pending.findIndex((request) => request.timeoutId === timeoutId);
+        if (index !== -1) {
+          pending.splice(index, 1);
+        }
+        reject(new Error(`ASR timed out after ${timeoutMs} ms`));
+        // The worker is mid-request; kill it so later requests start clean
+        if (this.child === child) {
+          this.child = null;
+        }
+        child.kill("SIGKILL");
+      }, timeoutMs);
+
+      pending.push({ resolve, reject, timeoutId });
+      child.stdin.write(`${JSON.stringify(payload)}\n`);
+    });
   }
 
-  if (options.model) {
-    args.push("--model", options.model);
+  async transcribe(
+    audioPath: string,
+    outputDir: string,
+    options: AsrOptions = {}
+  ): Promise<AsrResult> {
+    ensureDir(outputDir);
+    const response = await this.request(
+      { audio_path: audioPath, output_dir: outputDir, ...toRequestOptions(options) },
+      options.timeoutMs ?? DEFAULT_TIMEOUT_MS
+    );
+    return toAsrResult(response as AsrOutput);
   }
 
-  const result = await runCommand(args[0], args.slice(1), {
-    timeoutMs: options.timeoutMs ?? DEFAULT_TIMEOUT_MS
-  });
+  /**
+   * Transcribe several files in one request. The worker decodes the next file
+   * while the current one is transcribed; results come back in input order.
+   */
+  async transcribeBatch(
+    items: AsrBatchItem[],
+    options: AsrOptions = {}
+  ): Promise<AsrResult[]> {
+    if (items.length === 0) {
+      return [];
+    }
+    for (const item of items) {
+      ensureDir(item.outputDir);
+    }
+    const response = await this.request(
+      {
+        items: items.map((item) => ({ audio_path: item.audioPath, output_dir: item.outputDir })),
+        ...toRequestOptions(options)
+      },
+      options.timeoutMs ?? DEFAULT_TIMEOUT_MS * items.length
+    );
+    return (response as { results: AsrOutput[] }).results.map(toAsrResult);
+  }
 
-  if (result.exitCode !== 0) {
-    throw new Error(`ASR failed (code=${result.exitCode}): ${result.stderr}`);
+  /**
+   * Stop the worker: close stdin so it exits after any queued request, or kill it
+   * when nothing is pending (it may still be loading or downloading a model nobody needs).
+   */
+  close(): void {
+    if (this.child) {
+      if (this.pending.length === 0) {
+        this.child.kill("SIGKILL");
+      } else {
+        this.child.stdin.end();
+      }
+      this.child = null;
+    }
   }
+}
 
-  // Parse the JSON output from stdout (last line)
-  const stdout = result.stdout?.trim() ?? "";
-  const lines = stdout.split("\n");
-  const lastLine = lines[lines.length - 1];
+let sharedWorker: AsrWorker | null = null;
 
-  if (!lastLine) {
-    throw new Error("ASR produced no output");
+/**
+ * Get the process-wide ASR worker, spawning it on first use.
+ */
+export function getAsrWorker(): AsrWorker {
+  if (!sharedWorker) {
+    sharedWorker = new AsrWorker();
   }
+  return sharedWorker;
+}
 
-  try {
-    const output = JSON.parse(lastLine) as {
-      segments_count: number;
-      language: string | null;
-      language_probability: number | null;
-      json_path: string;
-      srt_path: string;
-    };
+/**
+ * Shut down the shared ASR worker (if any) so the Node process can exit.
+ */
+export function closeAsrWorker(): void {
+  sharedWorker?.close();
+  sharedWorker = null;
+}
 
-    return {
-      segmentsCount: output.segments_count,
-      language: output.language,
-      languageProbability: output.language_probability,
-      jsonPath: output.json_path,
-      srtPath: output.srt_path
-    };
-  } catch {
-    throw new Error(`Failed to parse ASR output: ${lastLine}`);
-  }
+/**
+ * Run ASR on an audio or video file using faster-whisper via the shared Python worker.
+ * Video containers are decoded directly; there is no need to extract a WAV first.
+ * Produces source_segments.json and source.srt in the output directory.
+ */
+export async function runAsr(
+  audioPath: string,
+  outputDir: string,
+  options: AsrOptions = {}
+): Promise<AsrResult> {
+  return await getAsrWorker().transcribe(audioPath, outputDir, options);
+}
+
+/**
+ * Run ASR on several files via the shared worker, overlapping decode with transcription.
+ */
+export async function runAsrBatch(
+  items: AsrBatchItem[],
+  options: AsrOptions = {}
+): Promise<AsrResult[]> {
+  return await getAsrWorker().transcribeBatch(items, options);
 }
 
 /**
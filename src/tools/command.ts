@@ -12,6 +12,10 @@ type CommandOptions = {
   env?: NodeJS.ProcessEnv;
   timeoutMs?: number;
   maxOutputChars?: number;
+  // Discard stdout instead of piping it (e.g. ffmpeg writing to a file)
+  ignoreStdout?: boolean;
+  // Keep the last maxOutputChars of stderr instead of the first; errors are usually at the end
+  stderrTail?: boolean;
 };
 
 function appendChunk(buffer: string, chunk: string, maxChars: number): string {
@@ -23,6 +27,11 @@ function appendChunk(buffer: string, chunk: string, maxChars: number): string {
   return buffer + chunk.slice(0, remaining);
 }
 
+function appendTail(buffer: string, chunk: string, maxChars: number): string {
+  const combined = buffer + chunk;
+  return combined.length > maxChars ? combined.slice(-maxChars) : combined;
+}
+
 export async function runCommand(
   command: string,
   args: string[],
@@ -35,10 +44,15 @@ export async function runCommand(
     const child = spawn(command, args, {
       cwd: options.cwd,
       env: options.env,
-      stdio: ["ignore", "pipe", "pipe"]
+      stdio: ["ignore", options.ignoreStdout ? "ignore" : "pipe", "pipe"]
     });
+    const appendStderr = options.stderrTail ? appendTail : appendChunk;
 
-    let stdout = "";
+    // Keep raw stdout bytes and decode once at exit: cheaper than per-chunk decoding
+    // and never splits a multi-byte UTF-8 character across chunk boundaries.
+    // (For stdout the maxOutputChars limit is applied to bytes.)
+    const stdoutChunks: Buffer[] = [];
+    let stdoutBytes = 0;
     let stderr = "";
     let timeoutId: NodeJS.Timeout | undefined;
 
@@ -48,11 +62,16 @@ export async function runCommand(
       }, options.timeoutMs);
     }
 
-    child.stdout.on("data", (chunk) => {
-      stdout = appendChunk(stdout, chunk.toString(), maxChars);
+    child.stdout?.on("data", (chunk: Buffer) => {
+      if (stdoutBytes >= maxChars) {
+        return;
+      }
+      const kept = chunk.subarray(0, maxChars - stdoutBytes);
+      stdoutChunks.push(kept);
+      stdoutBytes += kept.length;
     });
-    child.stderr.on("data", (chunk) => {
-      stderr = appendChunk(stderr, chunk.toString(), maxChars);
+    child.stderr?.on("data", (chunk) => {
+      stderr = appendStderr(stderr, chunk.toString(), maxChars);
     });
 
     child.on("error", (error) => {
@@ -67,7 +86,7 @@ export async function runCommand(
         clearTimeout(timeoutId);
       }
       resolve({
-        stdout: stdout.trim(),
+        stdout: Buffer.concat(stdoutChunks, stdoutBytes).toString("utf8").trim(),
         stderr: stderr.trim(),
         exitCode: code,
         durationMs: Date.now() - start
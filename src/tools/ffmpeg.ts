@@ -1,10 +1,155 @@
 import path from "node:path";
 import fs from "node:fs";
+import { createHash } from "node:crypto";
 import { ensureDir, fileExists, fileSize } from "../utils/fs.js";
-import { runCommand } from "./command.js";
+import { CommandResult, runCommand } from "./command.js";
+import { srtToAss } from "../subtitles/ass.js";
 
 const DEFAULT_TIMEOUT_MS = 60_000;
 
+export type VideoEncoder = "auto" | "nvenc" | "amf" | "x264";
+
+type ResolvedEncoder = Exclude<VideoEncoder, "auto">;
+
+export type RenderQuality = "speed" | "balanced" | "quality";
+
+// libx264 arguments per quality level; burned-in subtitles over natural video
+// gain little from slower presets, so "speed" is the default
+const X264_QUALITY_ARGS: Record<RenderQuality, string[]> = {
+  speed: ["-preset", "veryfast", "-crf", "23", "-x264-params", "aq-mode=1:rc-lookahead=20"],
+  balanced: ["-preset", "medium", "-crf", "23"],
+  quality: ["-preset", "slow", "-crf", "23"]
+};
+
+type BurnOptions = {
+  encoder?: VideoEncoder;
+  fontSize?: number;
+  quality?: RenderQuality;
+  // Apply loudness normalization in the same pass instead of a second ffmpeg run
+  loudnorm?: boolean;
+};
+
+const LOUDNORM_FILTER = "loudnorm=I=-16:TP=-1.5:LRA=11";
+
+// Only errors reach stderr, so a failed run's message is not buried under progress output
+const FFMPEG_QUIET_ARGS = ["-loglevel", "error", "-nostats"];
+
+type FfmpegOptions = {
+  cwd?: string;
+  timeoutMs: number;
+};
+
+/**
+ * Run an ffmpeg job that writes to a file: stdout is discarded and the tail of stderr kept.
+ */
+function runFfmpeg(args: string[], options: FfmpegOptions): Promise<CommandResult> {
+  return runCommand("ffmpeg", [...FFMPEG_QUIET_ARGS, ...args], {
+    ...options,
+    ignoreStdout: true,
+    stderrTail: true
+  });
+}
+
+// Hardware encoders in order of preference, with their ffmpeg codec names
+const HARDWARE_ENCODERS: Array<[ResolvedEncoder, string]> = [
+  ["nvenc", "h264_nvenc"],
+  ["amf", "h264_amf"]
+];
+
+let workingHardwareEncoders: Promise<ResolvedEncoder[]> | null = null;
+
+/**
+ * Check that ffmpeg can actually encode one frame with a codec.
+ * `ffmpeg -encoders` only lists what was compiled in, not whether a GPU/driver is present.
+ */
+async function canEncode(codec: string): Promise<boolean> {
+  try {
+    const result = await runFfmpeg(
+      ["-f", "lavfi", "-i", "nullsrc", "-frames:v", "1", "-c:v", codec, "-f", "null", "-"],
+      { timeoutMs: 10_000 }
+    );
+    return result.exitCode === 0;
+  } catch {
+    return false;
+  }
+}
+
+/**
+ * Hardware H.264 encoders that pass a test encode, in order of preference.
+ * Probed once per process.
+ */
+function detectHardwareEncoders(): Promise<ResolvedEncoder[]> {
+  if (!workingHardwareEncoders) {
+    workingHardwareEncoders = Promise.all(
+      HARDWARE_ENCODERS.map(async ([encoder, codec]) => ((await canEncode(codec)) ? encoder : null))
+    ).then((encoders) => encoders.filter((encoder): encoder is ResolvedEncoder => encoder !== null));
+  }
+  return workingHardwareEncoders;
+}
+
+/**
+ * Encoders to try in order: the working hardware encoders (nvenc, then amf) for "auto",
+ * or the requested one, always ending with libx264.
+ */
+async function resolveEncoderChain(encoder: VideoEncoder): Promise<ResolvedEncoder[]> {
+  const chain: ResolvedEncoder[] = encoder === "auto" ? await detectHardwareEncoders() : [encoder];
+  return chain.includes("x264") ? chain : [...chain, "x264"];
+}
+
+/**
+ * Build ffmpeg arguments for a subtitle burn with the given encoder.
+ * NVENC decodes with NVDEC when it can (ffmpeg falls back to software decode for codecs or
+ * bit depths it can't handle) and encodes from system memory, where the ass filter runs anyway.
+ */
+function buildBurnArgs(
+  encoder: ResolvedEncoder,
+  videoPath: string,
+  subtitleFilter: string,
+  audioArgs: string[],
+  quality: RenderQuality,
+  outputPath: string
+): string[] {
+  switch (encoder) {
+    case "nvenc":
+      return [
+        "-y",
+        "-hwaccel", "cuda",
+        "-i", videoPath,
+        "-vf", subtitleFilter,
+        "-c:v", "h264_nvenc",
+        "-preset", "p4",
+        "-rc", "vbr",
+        "-cq", "23",
+        "-b:v", "0",
+        ...audioArgs,
+        outputPath
+      ];
+    case "amf":
+      return [
+        "-y",
+        "-i", videoPath,
+        "-vf", subtitleFilter,
+        "-c:v", "h264_amf",
+        "-quality", "balanced",
+        "-rc", "cqp",
+        "-qp_i", "23",
+        "-qp_p", "23",
+        ...audioArgs,
+        outputPath
+      ];
+    case "x264":
+      return [
+        "-y",
+        "-i", videoPath,
+        "-vf", subtitleFilter,
+        "-c:v", "libx264",
+        ...X264_QUALITY_ARGS[quality],
+        ...audioArgs,
+        outputPath
+      ];
+  }
+}
+
 /**
  * Find thumbnail file in directory (yt-dlp may produce various formats like webp, jpg, png)
  */
@@ -50,8 +195,7 @@ export async function normalizeThumbnail(
   }
 
   // Convert using ffmpeg
-  const result = await runCommand(
-    "ffmpeg",
+  const result = await runFfmpeg(
     [
       "-y",
       "-i", inputPath,
@@ -82,11 +226,16 @@ export async function extractAudio(
 ): Promise<void> {
   ensureDir(path.dirname(wavPath));
 
-  const result = await runCommand(
-    "ffmpeg",
+  const result = await runFfmpeg(
     [
       "-y",
+      // Multithreaded demux/resample; hardware decode where available
+      "-hwaccel", "auto",
+      "-threads", "0",
+      "-filter_threads", "0",
       "-i", videoPath,
+      // Only the first audio stream is read
+      "-map", "0:a:0",
       "-vn",
       "-acodec", "pcm_s16le",
       "-ar", "16000",
@@ -106,33 +255,52 @@ export async function extractAudio(
 }
 
 /**
- * Burn subtitles into video
+ * Burn subtitles into video.
+ * Uses a working hardware encoder when available, falling back through
+ * nvenc -> amf -> libx264 if an encode fails.
  */
 export async function burnSubtitles(
   videoPath: string,
   srtPath: string,
   fontPath: string,
-  outputPath: string
+  outputPath: string,
+  options: BurnOptions = {}
 ): Promise<void> {
   ensureDir(path.dirname(outputPath));
 
-  // Escape special characters for ffmpeg filter (Windows paths need special handling)
-  const escapedSrt = srtPath.replace(/\\/g, "/").replace(/:/g, "\\:");
+  // Bake the style into an ASS file once so libass skips SRT conversion and force_style
+  const style = {
+    fontName: path.basename(fontPath, path.extname(fontPath)),
+    fontSize: options.fontSize ?? 24
+  };
+  // Name the ASS file by a hash of its source and style and run ffmpeg from its directory,
+  // so the filter only sees a bare [0-9a-f] filename and needs no path escaping
+  const assName = `${createHash("blake2b512")
+    .update(`${path.resolve(srtPath)}\0${style.fontName}\0${style.fontSize}`)
+    .digest("hex")
+    .slice(0, 16)}.ass`;
+  const subsDir = path.join(path.dirname(path.resolve(srtPath)), ".subs");
+  srtToAss(srtPath, path.join(subsDir, assName), style);
+  const subtitleFilter = `ass=${assName}`;
 
-  const result = await runCommand(
-    "ffmpeg",
-    [
-      "-y",
-      "-i", videoPath,
-      "-vf", `subtitles='${escapedSrt}':force_style='FontName=${path.basename(fontPath, path.extname(fontPath))},FontSize=24,PrimaryColour=&HFFFFFF,OutlineColour=&H000000,Outline=2'`,
-      "-c:a", "copy",
-      outputPath
-    ],
-    { timeoutMs: DEFAULT_TIMEOUT_MS * 10 }
-  );
+  const audioArgs = options.loudnorm ? ["-af", LOUDNORM_FILTER, "-c:a", "aac"] : ["-c:a", "copy"];
+  const quality = options.quality ?? "speed";
+  const inputPath = path.resolve(videoPath);
+  const targetPath = path.resolve(outputPath);
 
-  if (result.exitCode !== 0) {
-    throw new Error(`ffmpeg subtitle burn failed: ${result.stderr}`);
+  let result: CommandResult | null = null;
+  for (const encoder of await resolveEncoderChain(options.encoder ?? "auto")) {
+    result = await runFfmpeg(
+      buildBurnArgs(encoder, inputPath, subtitleFilter, audioArgs, quality, targetPath),
+      { cwd: subsDir, timeoutMs: DEFAULT_TIMEOUT_MS * 10 }
+    );
+    if (result.exitCode === 0) {
+      break;
+    }
+  }
+
+  if (!result || result.exitCode !== 0) {
+    throw new Error(`ffmpeg subtitle burn failed: ${result?.stderr}`);
   }
 
   if (!fileExists(outputPath) || fileSize(outputPath) <= 0) {
@@ -149,12 +317,11 @@ export async function normalizeLoudness(
 ): Promise<void> {
   ensureDir(path.dirname(outputPath));
 
-  const result = await runCommand(
-    "ffmpeg",
+  const result = await runFfmpeg(
     [
       "-y",
       "-i", inputPath,
-      "-af", "loudnorm=I=-16:TP=-1.5:LRA=11",
+      "-af", LOUDNORM_FILTER,
       "-c:v", "copy",
       outputPath
     ],
@@ -170,14 +337,30 @@ export async function normalizeLoudness(
   }
 }
 
-/**
- * Check video is playable using ffprobe
- */
-export async function probeVideo(videoPath: string): Promise<{
+type ProbeResult = {
   hasVideo: boolean;
   hasAudio: boolean;
   durationSeconds: number | null;
-}> {
+};
+
+// ffprobe output only depends on file contents, so key on path + mtime + size
+const probeCache = new Map<string, ProbeResult>();
+
+/**
+ * Check video is playable using ffprobe (cached per file version)
+ */
+export async function probeVideo(videoPath: string): Promise<ProbeResult> {
+  if (!fileExists(videoPath)) {
+    throw new Error(`ffprobe failed: file not found: ${videoPath}`);
+  }
+
+  const stat = fs.statSync(videoPath, { bigint: true });
+  const cacheKey = `${path.resolve(videoPath)}\0${stat.mtimeNs}\0${stat.size}`;
+  const cached = probeCache.get(cacheKey);
+  if (cached) {
+    return cached;
+  }
+
   const result = await runCommand(
     "ffprobe",
     [
@@ -205,5 +388,7 @@ export async function probeVideo(videoPath: string): Promise<{
   const durationStr = data.format?.duration;
   const durationSeconds = durationStr ? parseFloat(durationStr) : null;
 
-  return { hasVideo, hasAudio, durationSeconds };
+  const probe = { hasVideo, hasAudio, durationSeconds };
+  probeCache.set(cacheKey, probe);
+  return probe;
 }
@@ -1,5 +1,6 @@
 import path from "node:path";
 import { ensureDir, fileExists, fileSize, writeJson } from "../utils/fs.js";
+import { getCommandVersion } from "../utils/env.js";
 import { runCommand } from "./command.js";
 
 export type YtDlpInfo = Record<string, unknown>;
@@ -33,15 +34,12 @@ function readString(value: unknown): string | null {
 }
 
 function normalizePreflight(info: YtDlpInfo, url: string): PreflightResult {
-  const duration =
-    readNumber(info.duration) ??
-    readNumber(info.duration_seconds) ??
-    readNumber(info["duration"] as unknown);
-  const isLive =
-    Boolean(info.is_live) ||
-    String(info.live_status ?? "").toLowerCase() === "live" ||
-    String(info.live_status ?? "").toLowerCase() === "is_live";
-  const liveStatus = readString(info.live_status) ?? readString(info.live_status_text);
+  // Read each field once by name; the info dict can carry hundreds of keys
+  const duration = readNumber(info.duration) ?? readNumber(info.duration_seconds);
+  const rawLiveStatus = info.live_status;
+  const liveStatusLower = typeof rawLiveStatus === "string" ? rawLiveStatus.toLowerCase() : "";
+  const isLive = Boolean(info.is_live) || liveStatusLower === "live" || liveStatusLower === "is_live";
+  const liveStatus = readString(rawLiveStatus) ?? readString(info.live_status_text);
 
   return {
     info,
@@ -105,26 +103,52 @@ export function preflightPasses(
   return { ok: true };
 }
 
+let aria2cAvailable: Promise<boolean> | null = null;
+
+/**
+ * Check once per process whether aria2c is installed for use as yt-dlp's external downloader.
+ */
+function hasAria2c(): Promise<boolean> {
+  if (!aria2cAvailable) {
+    aria2cAvailable = getCommandVersion("aria2c", ["--version"]).then((version) => version !== null);
+  }
+  return aria2cAvailable;
+}
+
+type DownloadOptions = {
+  includeComments?: boolean;
+};
+
 export async function download(
   videoUrl: string,
   outputDir: string,
-  archivePath: string
+  archivePath: string,
+  options: DownloadOptions = {}
 ): Promise<void> {
   ensureDir(outputDir);
   ensureDir(path.dirname(archivePath));
 
   const outputTemplate = path.join(outputDir, "video.%(ext)s");
 
+  // Fetch DASH/HLS fragments in parallel; use multi-connection aria2c when it is installed
+  const downloaderArgs = ["--concurrent-fragments", "8"];
+  if (await hasAria2c()) {
+    downloaderArgs.push("--downloader", "aria2c", "--downloader-args", "aria2c:-x16 -s16 -k1M");
+  }
+
   const result = await runCommand(
     "yt-dlp",
     [
       "--no-playlist",
+      ...downloaderArgs,
       "--download-archive",
       archivePath,
       "-f",
       "bv*[ext=mp4]+ba[ext=m4a]/b[ext=mp4]",
       "--write-info-json",
       "--write-thumbnail",
+      // Comment scraping is slow and unused by the pipeline; override any user yt-dlp config
+      options.includeComments ? "--write-comments" : "--no-write-comments",
       "-o",
       outputTemplate,
       videoUrl
@@ -79,15 +79,29 @@ export async function getCommandVersion(command: string, args: string[]): Promis
   return null;
 }
 
+type ToolVersions = Pick<EnvSnapshot, "python" | "ffmpeg" | "ytdlp">;
+
+let toolVersions: Promise<ToolVersions> | null = null;
+
+/**
+ * Look up external tool versions once per process; they cannot change mid-run.
+ */
+function getToolVersions(): Promise<ToolVersions> {
+  if (!toolVersions) {
+    toolVersions = Promise.all([
+      getCommandVersion("python", ["--version"]),
+      getCommandVersion("ffmpeg", ["-version"]),
+      getCommandVersion("yt-dlp", ["--version"]),
+    ]).then(([python, ffmpeg, ytdlp]) => ({ python, ffmpeg, ytdlp }));
+  }
+  return toolVersions;
+}
+
 /**
  * Capture current environment snapshot
  */
 export async function getEnvSnapshot(): Promise<EnvSnapshot> {
-  const [python, ffmpeg, ytdlp] = await Promise.all([
-    getCommandVersion("python", ["--version"]),
-    getCommandVersion("ffmpeg", ["-version"]),
-    getCommandVersion("yt-dlp", ["--version"]),
-  ]);
+  const { python, ffmpeg, ytdlp } = await getToolVersions();
 
   return {
     node: process.version,